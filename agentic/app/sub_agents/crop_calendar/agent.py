@@ -4,7 +4,7 @@ from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 
 
-from app.sub_agents.satellite_soil_agent.agent import create_soil_agent
+from app.sub_agents.satellite_soil_agent.agent import get_soil_agent
 
 crop_calendar_agent = Agent(
     name="CropCalendarAgent",
@@ -17,6 +17,6 @@ crop_calendar_agent = Agent(
     (Your detailed instructions remain the same)
     """),
     tools=[
-        AgentTool(agent=create_soil_agent()),
+        AgentTool(agent=get_soil_agent()),
     ],
 )
\ No newline at end of file
@@ -3,7 +3,7 @@
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 
-from app.sub_agents.satellite_soil_agent.agent import create_soil_agent
+from app.sub_agents.satellite_soil_agent.agent import get_soil_agent
 
 crop_predictor_agent = Agent(
     name="CropPredictorAgent",
@@ -16,6 +16,6 @@ crop_predictor_agent = Agent(
     3. Combine the results from your tools to recommend suitable crops.
     """),
     tools=[
-        AgentTool(agent=create_soil_agent()),
+        AgentTool(agent=get_soil_agent()),
     ],
 )
\ No newline at end of file
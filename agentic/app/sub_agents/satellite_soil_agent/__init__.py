@@ -1 +1 @@
-from .agent import create_soil_agent
\ No newline at end of file
+from .agent import create_soil_agent, get_soil_agent
\ No newline at end of file
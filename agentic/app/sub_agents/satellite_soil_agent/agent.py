@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from google.adk.agents import Agent
 
 from app.tools.satellite_soil_tools import read_soil_excel
@@ -13,4 +15,9 @@ def create_soil_agent():
             "Use the `read_soil_excel` tool to retrieve recent data and analyze it."
         ),
         tools=[read_soil_excel],
-    )
\ No newline at end of file
+    )
+
+@lru_cache(maxsize=None)
+def get_soil_agent():
+    """Returns the SoilAgent shared by every AgentTool that wraps it."""
+    return create_soil_agent()
\ No newline at end of file
@@ -9,6 +9,7 @@ from app.tools.weather_tools import (
     search_weather_google,
     get_weather_info
 )
+from app.tools.agro_met_tools import get_agro_met_summary, get_farms_agro_met_summary
 
 weather_agent = Agent(
     name="weather_agent",
@@ -19,6 +20,12 @@ weather_agent = Agent(
 
     You are an advanced weather agent designed to provide comprehensive weather information and insights, particularly for agricultural and farming applications. You have access to multiple data sources and should provide accurate, detailed, and actionable weather information.
     
+    For irrigation and spraying advice on the user's farms, call `get_farms_agro_met_summary`,
+    which covers every farm in the profile at once. For any other place, call `get_agro_met_summary`
+    with the location, the crop's masterCropId and its soil moisture percent. Base your answer on
+    the precomputed growing degree days, ET0, rain accumulation, irrigation deficit and safe spray
+    windows they return instead of doing the arithmetic yourself.
+
     (Your detailed instructions remain the same)
     """,
     tools=[
@@ -26,6 +33,8 @@ weather_agent = Agent(
         get_current_weather,
         get_weather_forecast,
         search_weather_google,
-        get_weather_info
+        get_weather_info,
+        get_agro_met_summary,
+        get_farms_agro_met_summary
     ],
 )
\ No newline at end of file
@@ -0,0 +1,448 @@
+import json
+import math
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+
+from app.tools.weather_tools import get_weather_forecast, get_weather_forecast_for_coordinates
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Base temperatures (°C) for growing degree days, keyed by masterCropId.
+# A crop's knowledgeBase.idealConditions.baseTemperatureCelsius takes precedence.
+CROP_BASE_TEMPERATURES_C = {
+    "master_crop_sugarcane": 12.0,
+    "master_crop_tomato": 10.0,
+    "master_crop_chickpea": 5.0,
+}
+DEFAULT_BASE_TEMPERATURE_C = 10.0
+
+# Root-zone water holding capacity (mm) that soilMoisturePercent refers to
+DEFAULT_AVAILABLE_WATER_MM = 100.0
+# Irrigate once the projected soil moisture drops below this percentage
+DEFAULT_IRRIGATION_THRESHOLD_PERCENT = 50.0
+
+# Spraying is safe when wind is calm and no rain falls in the slot or shortly after
+DEFAULT_MAX_SPRAY_WIND_MS = 4.0
+DEFAULT_RAIN_FREE_HOURS_AFTER_SPRAY = 6
+
+# The agent's user profile: farms[] to summarise and masterCrops[] with optional
+# per-crop base temperatures
+PROFILE_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "user1.json")
+
+FORECAST_STEP_HOURS = 3
+SLOTS_PER_DAY = 24 // FORECAST_STEP_HOURS
+# OpenWeather's free 3-hourly forecast covers 5 days
+MAX_FORECAST_DAYS = 5
+SOLAR_CONSTANT = 0.0820  # MJ m-2 min-1 (FAO-56)
+
+
+def _to_float(value: Any) -> float:
+    """Converts a forecast field to float, mapping 'N/A' and missing values to NaN."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _extraterrestrial_radiation(latitude_deg: "np.ndarray", day_of_year: "np.ndarray") -> "np.ndarray":
+    """
+    Daily extraterrestrial radiation Ra (MJ m-2 day-1) as in FAO-56 equation 21.
+
+    Args:
+        latitude_deg: Latitudes of shape (farms, 1)
+        day_of_year: Day-of-year values of shape (1, days)
+
+    Returns:
+        Array of shape (farms, days)
+    """
+    import numpy as np
+
+    phi = np.radians(latitude_deg)
+    angle = 2 * np.pi * day_of_year / 365
+    inverse_distance = 1 + 0.033 * np.cos(angle)
+    declination = 0.409 * np.sin(angle - 1.39)
+    sunset_angle = np.arccos(np.clip(-np.tan(phi) * np.tan(declination), -1.0, 1.0))
+    return (24 * 60 / np.pi) * SOLAR_CONSTANT * inverse_distance * (
+        sunset_angle * np.sin(phi) * np.sin(declination)
+        + np.cos(phi) * np.cos(declination) * np.sin(sunset_angle)
+    )
+
+
+def _spray_windows(safe_row: "np.ndarray", slot_times: List[datetime]) -> List[Dict[str, Any]]:
+    """
+    Merges consecutive safe 3-hour slots into start/end spray windows, given as
+    ISO 8601 times with the forecast location's UTC offset.
+    """
+    import numpy as np
+
+    edges = np.diff(np.concatenate(([0], safe_row.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    windows = []
+    for start, end in zip(starts, ends):
+        window_end = slot_times[end - 1] + timedelta(hours=FORECAST_STEP_HOURS)
+        windows.append({
+            "start": slot_times[start].isoformat(),
+            "end": window_end.isoformat(),
+            "hours": int(end - start) * FORECAST_STEP_HOURS
+        })
+    return windows
+
+
+@lru_cache(maxsize=None)
+def _load_profile() -> Dict[str, Any]:
+    """
+    Loads the "projectKisanData" section of the user profile once; block
+    comments in the file are ignored. Returns {} if it cannot be read.
+    """
+    try:
+        with open(PROFILE_DATA_PATH, encoding="utf-8") as f:
+            data = json.loads(re.sub(r"/\*.*?\*/", "", f.read(), flags=re.DOTALL))
+    except (OSError, ValueError):
+        return {}
+    return data.get("projectKisanData", data)
+
+
+def get_crop_base_temperature(master_crop_id: str, master_crops: Optional[List[Dict[str, Any]]] = None) -> float:
+    """
+    Resolves the growing degree day base temperature for a crop.
+
+    Args:
+        master_crop_id: The masterCropId of the crop (e.g., "master_crop_sugarcane")
+        master_crops: Optional masterCrops[] list from the user profile
+
+    Returns:
+        Base temperature in °C
+    """
+    for crop in master_crops or []:
+        if crop.get("masterCropId") == master_crop_id:
+            ideal = (crop.get("knowledgeBase") or {}).get("idealConditions") or {}
+            if "baseTemperatureCelsius" in ideal:
+                return float(ideal["baseTemperatureCelsius"])
+    return CROP_BASE_TEMPERATURES_C.get(master_crop_id, DEFAULT_BASE_TEMPERATURE_C)
+
+
+def build_farm_agro_met_inputs(kisan_data: Dict[str, Any], forecasts_by_farm: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Builds the per-farm inputs for compute_agro_met_batch from the user profile.
+
+    Args:
+        kisan_data: The "projectKisanData" section of the user profile
+        forecasts_by_farm: Mapping of farmId to a get_weather_forecast() payload
+
+    Returns:
+        List of farm input dictionaries, one per farm that has a forecast
+    """
+    master_crops = kisan_data.get("masterCrops", [])
+    farms = []
+    for farm in kisan_data.get("farms", []):
+        farm_id = farm.get("farmId")
+        if farm_id not in forecasts_by_farm:
+            continue
+        master_crop_id = (farm.get("crop") or {}).get("masterCropId", "")
+        soil_and_water = (farm.get("detailedStatus") or {}).get("soilAndWater") or {}
+        coordinates = ((farm.get("location") or {}).get("centroid") or {}).get("coordinates") or []
+        farms.append({
+            "farm_id": farm_id,
+            "forecast": forecasts_by_farm[farm_id],
+            "base_temperature": get_crop_base_temperature(master_crop_id, master_crops),
+            "soil_moisture_percent": soil_and_water.get("soilMoisturePercent"),
+            # GeoJSON points are [longitude, latitude]
+            "latitude": coordinates[1] if len(coordinates) == 2 else None
+        })
+    return farms
+
+
+def compute_agro_met_batch(
+    farms: List[Dict[str, Any]],
+    crop_coefficient: float = 1.0,
+    available_water_mm: float = DEFAULT_AVAILABLE_WATER_MM,
+    irrigation_threshold_percent: float = DEFAULT_IRRIGATION_THRESHOLD_PERCENT,
+    max_spray_wind_ms: float = DEFAULT_MAX_SPRAY_WIND_MS,
+    rain_free_hours_after_spray: int = DEFAULT_RAIN_FREE_HOURS_AFTER_SPRAY,
+    max_days: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Computes agro-meteorological metrics for many farms' forecasts at once.
+
+    Every farm's 3-hourly forecast is stacked into one (farms x slots) array, so
+    daily growing degree days, Hargreaves ET0, rain accumulation, the soil water
+    balance and safe spray slots are evaluated in a single vectorized pass.
+    Slots are converted from UTC to the forecast's local time ("timezone" offset)
+    before they are binned into days. Daily metrics and totals cover only complete
+    local days (all 8 slots present): a partial first/last day has too few slots
+    for a meaningful min/max, so it is dropped rather than scaled. Spray windows
+    use every slot up to the end of the last reported day.
+
+    The soil water balance starts from soil_moisture_percent at the beginning of
+    the first complete local day; rain and evaporation in the hours before it
+    are not counted. When a forecast has no complete day, the totals and the
+    irrigation figures are None rather than 0.
+
+    Args:
+        farms: List of dictionaries with keys "farm_id", "forecast" (a
+            get_weather_forecast() payload), "base_temperature" (°C),
+            "soil_moisture_percent" and "latitude" (degrees; falls back to the
+            forecast's coordinates)
+        crop_coefficient: Kc applied to ET0 for the soil water balance
+        available_water_mm: Root-zone water capacity that soil moisture refers to
+        irrigation_threshold_percent: Soil moisture below which irrigation is due
+        max_spray_wind_ms: Maximum wind speed (m/s) for spraying
+        rain_free_hours_after_spray: Hours that must stay dry after a spray slot
+        max_days: Report at most this many complete local days per farm
+
+    Returns:
+        Dictionary containing per-farm metrics keyed by farm_id or error information
+    """
+    # numpy is only needed once metrics are computed, so building the agent
+    # tree that registers these tools does not import it
+    import numpy as np
+
+    try:
+        # Pre-seed the keys so results keep the order farms were passed in
+        results: Dict[str, Any] = {farm.get("farm_id"): None for farm in farms}
+        valid = []
+        for farm in farms:
+            forecast = farm.get("forecast") or {}
+            if not forecast.get("success") or not forecast.get("forecasts"):
+                results[farm.get("farm_id")] = {
+                    "success": False,
+                    "error": forecast.get("error", "No forecast data available")
+                }
+                continue
+            valid.append(farm)
+
+        if not valid:
+            return {"success": True, "farms": results}
+
+        # dt_txt is UTC; shift every slot to the location's local time
+        slot_times = []
+        for farm in valid:
+            local_zone = timezone(timedelta(seconds=int(farm["forecast"].get("timezone") or 0)))
+            slot_times.append([
+                datetime.strptime(item["datetime"], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc).astimezone(local_zone)
+                for item in farm["forecast"]["forecasts"]
+            ])
+        calendar = sorted({t.date() for times in slot_times for t in times})
+        day_lookup = {day: i for i, day in enumerate(calendar)}
+        n_farms, n_days = len(valid), len(calendar)
+        n_slots = max(len(times) for times in slot_times)
+
+        temperature = np.full((n_farms, n_slots), np.nan)
+        wind = np.full((n_farms, n_slots), np.nan)
+        precipitation = np.full((n_farms, n_slots), np.nan)
+        day_index = np.full((n_farms, n_slots), -1, dtype=np.int64)
+        for f, farm in enumerate(valid):
+            items = farm["forecast"]["forecasts"]
+            n = len(items)
+            temperature[f, :n] = [_to_float(item.get("temperature")) for item in items]
+            wind[f, :n] = [_to_float(item.get("wind_speed")) for item in items]
+            precipitation[f, :n] = [_to_float(item.get("precipitation", 0)) for item in items]
+            day_index[f, :n] = [day_lookup[t.date()] for t in slot_times[f]]
+
+        base_temperature = np.array(
+            [_to_float(farm.get("base_temperature", DEFAULT_BASE_TEMPERATURE_C)) for farm in valid]
+        )[:, None]
+        latitude = np.array([
+            _to_float(farm.get("latitude") if farm.get("latitude") is not None
+                      else (farm["forecast"].get("coordinates") or {}).get("lat"))
+            for farm in valid
+        ])[:, None]
+        soil_moisture = np.array([_to_float(farm.get("soil_moisture_percent")) for farm in valid])
+
+        # Daily aggregation of the 3-hourly slots via flat (farm, day) bins;
+        # days without all 8 slots are masked out as NaN
+        in_range = day_index >= 0
+        bins = (np.arange(n_farms)[:, None] * n_days + day_index)[in_range]
+        t_max = np.full(n_farms * n_days, -np.inf)
+        t_min = np.full(n_farms * n_days, np.inf)
+        daily_rain = np.zeros(n_farms * n_days)
+        slot_count = np.zeros(n_farms * n_days)
+        np.fmax.at(t_max, bins, temperature[in_range])
+        np.fmin.at(t_min, bins, temperature[in_range])
+        np.add.at(daily_rain, bins, np.nan_to_num(precipitation[in_range]))
+        np.add.at(slot_count, bins, 1)
+        has_data = (slot_count == SLOTS_PER_DAY).reshape(n_farms, n_days)
+        if max_days is not None:
+            has_data &= np.cumsum(has_data, axis=1) <= max_days
+        t_max = np.where(has_data, t_max.reshape(n_farms, n_days), np.nan)
+        t_min = np.where(has_data, t_min.reshape(n_farms, n_days), np.nan)
+        daily_rain = np.where(has_data, daily_rain.reshape(n_farms, n_days), np.nan)
+        t_mean = (t_max + t_min) / 2
+
+        gdd = np.clip(t_mean - base_temperature, 0, None)
+
+        # Hargreaves ET0 (mm/day); 0.408 converts MJ m-2 to mm of evaporated water
+        day_of_year = np.array([day.timetuple().tm_yday for day in calendar], dtype=float)[None, :]
+        ra = _extraterrestrial_radiation(latitude, day_of_year)
+        et0 = 0.0023 * 0.408 * ra * (t_mean + 17.8) * np.sqrt(np.clip(t_max - t_min, 0, None))
+
+        cumulative_rain = np.nancumsum(daily_rain, axis=1)
+
+        # Bucket soil water balance, projected day by day for all farms at once
+        storage = np.clip(soil_moisture, 0, 100) / 100 * available_water_mm
+        net_inflow = np.nan_to_num(daily_rain) - np.nan_to_num(et0 * crop_coefficient)
+        projected_storage = np.empty((n_farms, n_days))
+        for d in range(n_days):
+            storage = np.clip(storage + net_inflow[:, d], 0, available_water_mm)
+            projected_storage[:, d] = storage
+        projected_moisture = projected_storage / available_water_mm * 100
+        irrigation_deficit = np.clip(
+            irrigation_threshold_percent / 100 * available_water_mm - projected_storage, 0, None
+        )
+
+        # A slot is safe when calm, dry and followed by enough rain-free slots
+        rainy = precipitation > 0
+        rain_ahead = np.zeros_like(rainy)
+        for shift in range(1, math.ceil(rain_free_hours_after_spray / FORECAST_STEP_HOURS) + 1):
+            rain_ahead[:, :-shift] |= rainy[:, shift:]
+        safe = (wind <= max_spray_wind_ms) & (precipitation == 0) & ~rain_ahead
+
+        for f, farm in enumerate(valid):
+            days_with_data = np.flatnonzero(has_data[f])
+            due = days_with_data[irrigation_deficit[f, days_with_data] > 0]
+            n_farm_slots = len(slot_times[f])
+            if max_days is not None and len(days_with_data):
+                n_farm_slots = int(np.count_nonzero(day_index[f, :n_farm_slots] <= days_with_data[-1]))
+            daily = [
+                {
+                    "date": calendar[d].isoformat(),
+                    "temp_min": round(float(t_min[f, d]), 1),
+                    "temp_max": round(float(t_max[f, d]), 1),
+                    "gdd": round(float(gdd[f, d]), 1),
+                    "et0_mm": round(float(et0[f, d]), 2),
+                    "precipitation_mm": round(float(daily_rain[f, d]), 2),
+                    "cumulative_precipitation_mm": round(float(cumulative_rain[f, d]), 2),
+                    "projected_soil_moisture_percent": (
+                        None if np.isnan(projected_moisture[f, d]) else round(float(projected_moisture[f, d]), 1)
+                    ),
+                    "irrigation_deficit_mm": (
+                        None if np.isnan(irrigation_deficit[f, d]) else round(float(irrigation_deficit[f, d]), 1)
+                    )
+                }
+                for d in days_with_data
+            ]
+            results[farm.get("farm_id")] = {
+                "success": True,
+                "location": farm["forecast"].get("location"),
+                "base_temperature": float(base_temperature[f, 0]),
+                "complete_days": len(daily),
+                "total_gdd": round(float(np.nansum(gdd[f])), 1) if daily else None,
+                "total_et0_mm": round(float(np.nansum(et0[f])), 2) if daily else None,
+                "total_precipitation_mm": round(float(np.nansum(daily_rain[f])), 2) if daily else None,
+                "irrigation_deficit_mm": daily[-1]["irrigation_deficit_mm"] if daily else None,
+                "irrigation_due_date": calendar[due[0]].isoformat() if len(due) else None,
+                "spray_windows": _spray_windows(safe[f, :n_farm_slots], slot_times[f][:n_farm_slots]),
+                "daily": daily
+            }
+
+        return {"success": True, "farms": results}
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Error computing agro-meteorological metrics: {str(e)}"
+        }
+
+
+def compute_agro_met_metrics(
+    forecast: Dict[str, Any],
+    base_temperature: float = DEFAULT_BASE_TEMPERATURE_C,
+    soil_moisture_percent: Optional[float] = None,
+    latitude: Optional[float] = None,
+    **thresholds: Any
+) -> Dict[str, Any]:
+    """
+    Computes agro-meteorological metrics for a single forecast payload.
+
+    Args:
+        forecast: A get_weather_forecast() payload
+        base_temperature: Crop base temperature (°C) for growing degree days
+        soil_moisture_percent: Current soil moisture from soilAndWater.soilMoisturePercent
+        latitude: Farm latitude; defaults to the forecast's coordinates
+        **thresholds: Optional overrides passed through to compute_agro_met_batch
+
+    Returns:
+        Dictionary containing the farm's metrics or error information
+    """
+    batch = compute_agro_met_batch(
+        [{
+            "farm_id": "farm",
+            "forecast": forecast,
+            "base_temperature": base_temperature,
+            "soil_moisture_percent": soil_moisture_percent,
+            "latitude": latitude
+        }],
+        **thresholds
+    )
+    if not batch["success"]:
+        return batch
+    return batch["farms"]["farm"]
+
+
+def get_agro_met_summary(location: str, master_crop_id: str = "", soil_moisture_percent: Optional[float] = None, days: int = 5) -> Dict[str, Any]:
+    """
+    Fetches the forecast for a location and returns precomputed agro-met numbers:
+    growing degree days, Hargreaves ET0, rain accumulation, irrigation deficit and
+    safe spray windows.
+
+    Args:
+        location: City name, state/country
+        master_crop_id: The farm's masterCropId (e.g., "master_crop_sugarcane")
+        soil_moisture_percent: Current soil moisture from the farm's soilAndWater status;
+            without it the irrigation deficit is not computed
+        days: Number of complete local days to report (1-5)
+
+    Returns:
+        Dictionary containing agro-met metrics or error information
+    """
+    # Fetch the whole forecast so `days` complete local days survive binning
+    forecast = get_weather_forecast(location, days=MAX_FORECAST_DAYS)
+    if not forecast["success"]:
+        return forecast
+    return compute_agro_met_metrics(
+        forecast,
+        base_temperature=get_crop_base_temperature(master_crop_id, _load_profile().get("masterCrops", [])),
+        soil_moisture_percent=soil_moisture_percent,
+        max_days=days
+    )
+
+
+def get_farms_agro_met_summary(days: int = 5) -> Dict[str, Any]:
+    """
+    Returns precomputed agro-met numbers for every farm in the user profile at
+    once: growing degree days, Hargreaves ET0, rain accumulation, irrigation
+    deficit against each farm's soil moisture and safe spray windows. Each farm's
+    forecast is fetched for its centroid and its crop's base temperature is used.
+
+    Args:
+        days: Number of complete local days to report (1-5)
+
+    Returns:
+        Dictionary containing per-farm metrics keyed by farmId or error information
+    """
+    kisan_data = _load_profile()
+    if not kisan_data.get("farms"):
+        return {
+            "success": False,
+            "error": "No farms found in the user profile"
+        }
+
+    forecasts_by_farm = {}
+    for farm in kisan_data["farms"]:
+        coordinates = ((farm.get("location") or {}).get("centroid") or {}).get("coordinates") or []
+        if len(coordinates) != 2:
+            forecasts_by_farm[farm.get("farmId")] = {
+                "success": False,
+                "error": "Farm has no centroid coordinates"
+            }
+            continue
+        # GeoJSON points are [longitude, latitude]
+        forecasts_by_farm[farm.get("farmId")] = get_weather_forecast_for_coordinates(
+            coordinates[1], coordinates[0], days=MAX_FORECAST_DAYS
+        )
+
+    return compute_agro_met_batch(build_farm_agro_met_inputs(kisan_data, forecasts_by_farm), max_days=days)
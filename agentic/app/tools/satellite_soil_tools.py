@@ -1,7 +1,6 @@
 
 from google.adk.tools.tool_context import ToolContext # Import ToolContext
 from io import BytesIO
-import pandas as pd
 import requests
 
 # Add tool_context to the function's arguments
@@ -32,6 +31,9 @@ def read_soil_excel(file_url: str, tool_context: ToolContext) -> str:
     else:
         print(f"--- Fetching and processing new data for {file_url} ---")
         try:
+            # pandas is only needed here, so it is imported on first use
+            import pandas as pd
+
             response = requests.get(file_url)
             response.raise_for_status()
             excel_file = BytesIO(response.content)
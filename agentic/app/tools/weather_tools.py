@@ -3,13 +3,18 @@ import json
 from typing import Dict, Any
 from datetime import datetime
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
 
-# Load environment variables from .env file
-load_dotenv()
+@lru_cache(maxsize=None)
+def get_openweather_api_key():
+    """
+    Returns the OpenWeather API key, loading the .env file on first use
+    instead of at import time.
+    """
+    from dotenv import load_dotenv
 
-# API Key - Loaded from .env file
-OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
+    load_dotenv()
+    return os.getenv("OPENWEATHER_API_KEY")
 
 def get_current_weather(location: str) -> Dict[str, Any]:
     """
@@ -22,13 +27,14 @@ def get_current_weather(location: str) -> Dict[str, Any]:
         Dictionary containing weather data or error information
     """
     try:
-        if not OPENWEATHER_API_KEY or OPENWEATHER_API_KEY == "YOUR_OPENWEATHER_API_KEY":
+        api_key = get_openweather_api_key()
+        if not api_key or api_key == "YOUR_OPENWEATHER_API_KEY":
             return {
                 "success": False,
                 "error": "OpenWeather API key not configured in .env file"
             }
 
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={OPENWEATHER_API_KEY}&units=metric"
+        url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={api_key}&units=metric"
         response = requests.get(url, timeout=10)
         data = response.json()
 
@@ -61,25 +67,20 @@ def get_current_weather(location: str) -> Dict[str, Any]:
             "error": f"Error fetching weather from OpenWeather: {str(e)}"
         }
 
-def get_weather_forecast(location: str, days: int = 5) -> Dict[str, Any]:
+def _fetch_forecast(query: str, days: int) -> Dict[str, Any]:
     """
-    Fetches weather forecast for the specified location and number of days.
-    
-    Args:
-        location: City name, state/country
-        days: Number of days for forecast (1-5)
-    
-    Returns:
-        Dictionary containing forecast data or error information
+    Fetches the 3-hourly forecast for an OpenWeather location query
+    (e.g. "q=Belagavi" or "lat=16.22&lon=74.75").
     """
     try:
-        if not OPENWEATHER_API_KEY or OPENWEATHER_API_KEY == "YOUR_OPENWEATHER_API_KEY":
+        api_key = get_openweather_api_key()
+        if not api_key or api_key == "YOUR_OPENWEATHER_API_KEY":
             return {
                 "success": False,
                 "error": "OpenWeather API key not configured in .env file"
             }
             
-        url = f"http://api.openweathermap.org/data/2.5/forecast?q={location}&appid={OPENWEATHER_API_KEY}&units=metric"
+        url = f"http://api.openweathermap.org/data/2.5/forecast?{query}&appid={api_key}&units=metric"
         response = requests.get(url, timeout=10)
         data = response.json()
 
@@ -99,6 +100,8 @@ def get_weather_forecast(location: str, days: int = 5) -> Dict[str, Any]:
             return {
                 "success": True,
                 "location": f"{data['city']['name']}, {data['city']['country']}",
+                "coordinates": data['city'].get('coord', {}),
+                "timezone": data['city'].get('timezone', 0),
                 "forecasts": forecasts
             }
         else:
@@ -112,6 +115,33 @@ def get_weather_forecast(location: str, days: int = 5) -> Dict[str, Any]:
             "error": f"Error fetching forecast: {str(e)}"
         }
 
+def get_weather_forecast(location: str, days: int = 5) -> Dict[str, Any]:
+    """
+    Fetches weather forecast for the specified location and number of days.
+    
+    Args:
+        location: City name, state/country
+        days: Number of days for forecast (1-5)
+    
+    Returns:
+        Dictionary containing forecast data or error information
+    """
+    return _fetch_forecast(f"q={location}", days)
+
+def get_weather_forecast_for_coordinates(latitude: float, longitude: float, days: int = 5) -> Dict[str, Any]:
+    """
+    Fetches weather forecast for a point, such as a farm's centroid.
+    
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+        days: Number of days for forecast (1-5)
+    
+    Returns:
+        Dictionary containing forecast data or error information
+    """
+    return _fetch_forecast(f"lat={latitude}&lon={longitude}", days)
+
 def get_comprehensive_weather_info(location: str, include_forecast: bool = False) -> Dict[str, Any]:
     """
     Fetches comprehensive weather information including current conditions and optional forecast.
@@ -0,0 +1,192 @@
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.tools import agro_met_tools
+from app.tools.agro_met_tools import (
+    _extraterrestrial_radiation,
+    _load_profile,
+    build_farm_agro_met_inputs,
+    compute_agro_met_batch,
+    compute_agro_met_metrics,
+    get_agro_met_summary,
+    get_farms_agro_met_summary,
+)
+
+# Temperatures for 00:00, 03:00, ..., 21:00 UTC: min 20, max 30
+DAY_TEMPS = [20, 21, 24, 28, 30, 27, 24, 22]
+
+
+def make_forecast(start, n_slots, wind=2.0, rain_slots=(), timezone=0, temps=None):
+    """Builds a get_weather_forecast() style payload of 3-hourly slots."""
+    forecasts = []
+    for i in range(n_slots):
+        slot = start + timedelta(hours=3 * i)
+        forecasts.append({
+            "datetime": slot.strftime('%Y-%m-%d %H:%M:%S'),
+            "temperature": temps[i] if temps else DAY_TEMPS[slot.hour // 3],
+            "humidity": 60,
+            "wind_speed": wind(i) if callable(wind) else wind,
+            "precipitation": 2.0 if i in rain_slots else 0
+        })
+    return {
+        "success": True,
+        "location": "Gokak, IN",
+        "coordinates": {"lat": 16.22, "lon": 74.75},
+        "timezone": timezone,
+        "forecasts": forecasts
+    }
+
+
+def test_gdd_uses_daily_min_max_above_base():
+    result = compute_agro_met_metrics(make_forecast(datetime(2025, 7, 20), 16), base_temperature=10)
+
+    assert [day["gdd"] for day in result["daily"]] == [15.0, 15.0]
+    assert result["total_gdd"] == 30.0
+
+
+def test_partial_days_are_dropped():
+    # 21:00 start: one slot on the first day, 40 slots in total
+    result = compute_agro_met_metrics(make_forecast(datetime(2025, 7, 20, 21), 40), base_temperature=10)
+
+    assert [day["date"] for day in result["daily"]] == [
+        "2025-07-21", "2025-07-22", "2025-07-23", "2025-07-24"
+    ]
+    assert result["total_gdd"] == 60.0
+    assert all(day["et0_mm"] > 0 for day in result["daily"])
+
+
+def test_no_complete_day_reports_no_totals():
+    result = compute_agro_met_metrics(make_forecast(datetime(2025, 7, 20, 12), 4), soil_moisture_percent=60)
+
+    assert result["success"]
+    assert result["complete_days"] == 0
+    assert result["daily"] == []
+    assert result["total_gdd"] is None
+    assert result["total_et0_mm"] is None
+    assert result["total_precipitation_mm"] is None
+    assert result["irrigation_deficit_mm"] is None
+
+
+def test_max_days_trims_to_complete_local_days():
+    # 40 UTC slots in IST: a partial first day, 4 complete days, a partial last day
+    forecast = make_forecast(datetime(2025, 7, 20), 40, timezone=19800)
+    result = compute_agro_met_metrics(forecast, base_temperature=10, max_days=2)
+
+    assert [day["date"] for day in result["daily"]] == ["2025-07-21", "2025-07-22"]
+    assert result["complete_days"] == 2
+    # IST slots start on the half hour, so the last slot of the 22nd ends at 02:30
+    assert result["spray_windows"][-1]["end"] == "2025-07-23T02:30:00+05:30"
+
+
+def test_hargreaves_et0_matches_formula():
+    result = compute_agro_met_metrics(make_forecast(datetime(2025, 7, 20), 8))
+    day_of_year = datetime(2025, 7, 20).timetuple().tm_yday
+    ra = float(_extraterrestrial_radiation(16.22, day_of_year))
+    expected = 0.0023 * 0.408 * ra * (25 + 17.8) * math.sqrt(10)
+
+    assert result["daily"][0]["et0_mm"] == pytest.approx(expected, abs=0.01)
+
+
+def test_missing_fields_are_treated_as_unknown():
+    forecast = make_forecast(datetime(2025, 7, 20), 8, wind=lambda i: "N/A" if i == 3 else 2.0)
+    forecast["forecasts"][5]["temperature"] = "N/A"
+    result = compute_agro_met_metrics(forecast, base_temperature=10)
+
+    # The N/A temperature is ignored by min/max; the N/A wind slot is never safe
+    assert result["daily"][0]["temp_min"] == 20.0
+    assert result["daily"][0]["temp_max"] == 30.0
+    assert [(w["start"], w["end"]) for w in result["spray_windows"]] == [
+        ("2025-07-20T00:00:00+00:00", "2025-07-20T09:00:00+00:00"),
+        ("2025-07-20T12:00:00+00:00", "2025-07-21T00:00:00+00:00"),
+    ]
+
+
+def test_rain_just_after_a_slot_blocks_spraying():
+    result = compute_agro_met_metrics(make_forecast(datetime(2025, 7, 20), 8, rain_slots=(4,)))
+
+    # 6 rain-free hours are required after spraying, so slots 2 and 3 are unsafe too
+    assert [(w["start"], w["end"], w["hours"]) for w in result["spray_windows"]] == [
+        ("2025-07-20T00:00:00+00:00", "2025-07-20T06:00:00+00:00", 6),
+        ("2025-07-20T15:00:00+00:00", "2025-07-21T00:00:00+00:00", 9),
+    ]
+    assert result["total_precipitation_mm"] == 2.0
+
+
+def test_times_are_shifted_to_local_timezone():
+    # 18:30 UTC is midnight IST, so these 8 slots make up one complete local day
+    forecast = make_forecast(datetime(2025, 7, 19, 18, 30), 8, timezone=19800, temps=DAY_TEMPS)
+    result = compute_agro_met_metrics(forecast)
+
+    assert [day["date"] for day in result["daily"]] == ["2025-07-20"]
+    assert result["spray_windows"][0]["start"] == "2025-07-20T00:00:00+05:30"
+
+
+def test_irrigation_deficit_needs_soil_moisture():
+    forecast = make_forecast(datetime(2025, 7, 20), 40)
+    without = compute_agro_met_metrics(forecast)
+    dry = compute_agro_met_metrics(forecast, soil_moisture_percent=52)
+
+    assert without["irrigation_deficit_mm"] is None
+    assert without["irrigation_due_date"] is None
+    assert dry["irrigation_due_date"] == "2025-07-20"
+    assert dry["irrigation_deficit_mm"] > 0
+
+
+def test_batch_keeps_farm_order_and_errors():
+    result = compute_agro_met_batch([
+        {"farm_id": "failed", "forecast": {"success": False, "error": "city not found"}},
+        {"farm_id": "ok", "forecast": make_forecast(datetime(2025, 7, 20), 8), "base_temperature": 12},
+    ])
+
+    assert list(result["farms"]) == ["failed", "ok"]
+    assert result["farms"]["failed"] == {"success": False, "error": "city not found"}
+    assert result["farms"]["ok"]["total_gdd"] == 13.0
+
+
+def test_summary_fetches_full_forecast_and_reports_requested_days(monkeypatch):
+    requested = []
+
+    def fake_forecast(location, days=5):
+        requested.append(days)
+        return make_forecast(datetime(2025, 7, 20), days * 8, timezone=19800)
+
+    monkeypatch.setattr(agro_met_tools, "get_weather_forecast", fake_forecast)
+    result = get_agro_met_summary("Gokak", "master_crop_sugarcane", days=1)
+
+    assert requested == [5]
+    assert result["complete_days"] == 1
+    assert result["base_temperature"] == 12.0
+    assert result["total_gdd"] == 13.0
+
+
+def test_farm_inputs_follow_profile_schema():
+    kisan_data = _load_profile()
+    farm_id = kisan_data["farms"][0]["farmId"]
+    forecast = make_forecast(datetime(2025, 7, 20), 8)
+
+    assert build_farm_agro_met_inputs(kisan_data, {farm_id: forecast}) == [{
+        "farm_id": "farm_sugarcane_konnur_1",
+        "forecast": forecast,
+        "base_temperature": 12.0,
+        "soil_moisture_percent": 60,
+        "latitude": 16.22,
+    }]
+
+
+def test_farms_summary_covers_every_profile_farm(monkeypatch):
+    requested = []
+
+    def fake_forecast(latitude, longitude, days=5):
+        requested.append((latitude, longitude))
+        return make_forecast(datetime(2025, 7, 20), 16)
+
+    monkeypatch.setattr(agro_met_tools, "get_weather_forecast_for_coordinates", fake_forecast)
+    result = get_farms_agro_met_summary(days=2)
+
+    assert requested == [(16.22, 74.75)]
+    farm = result["farms"]["farm_sugarcane_konnur_1"]
+    assert farm["complete_days"] == 2
+    assert farm["base_temperature"] == 12.0
+    assert farm["daily"][0]["projected_soil_moisture_percent"] < 60
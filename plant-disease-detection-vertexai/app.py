@@ -1,12 +1,11 @@
 import os
-from google.cloud import storage
-import vertexai
-from vertexai.generative_models import GenerativeModel, Part
-from google.oauth2 import service_account
+from functools import lru_cache
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import re
 
+from disease_index import get_disease_index, remediation_steps
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for Flutter app integration
 app.config['UPLOAD_FOLDER'] = 'uploads'
@@ -16,17 +15,38 @@ app.config['ALLOWED_EXTENSIONS'] = {'jpg', 'jpeg', 'png', 'gif'}
 storage_key_path = "gcp_storage.json"
 vertex_key_path = "plant-disease-vertex-api.json"
 
-# Authenticate with Google Cloud Storage using the first service account
-storage_credentials = service_account.Credentials.from_service_account_file(storage_key_path)
-storage_client = storage.Client(credentials=storage_credentials, project="codevipasana-442804")
 bucket_name = 'bq-gemini-plant-disease-image'  # replace with your GCS bucket name
-bucket = storage_client.bucket(bucket_name)
-
-# Authenticate with Vertex AI using the second service account
-vertex_credentials = service_account.Credentials.from_service_account_file(vertex_key_path)
 PROJECT_ID = "codevipasana-442804"
-vertexai.init(credentials=vertex_credentials, project=PROJECT_ID, location="us-central1")
 
+# The Google Cloud clients are created on first use rather than at import,
+# so a cold container can answer /health and / without paying for them.
+
+@lru_cache(maxsize=None)
+def get_bucket():
+    """
+    Authenticates with Google Cloud Storage using the first service account
+    and returns the upload bucket
+    """
+    from google.cloud import storage
+    from google.oauth2 import service_account
+
+    storage_credentials = service_account.Credentials.from_service_account_file(storage_key_path)
+    storage_client = storage.Client(credentials=storage_credentials, project=PROJECT_ID)
+    return storage_client.bucket(bucket_name)
+
+@lru_cache(maxsize=None)
+def get_model():
+    """
+    Authenticates with Vertex AI using the second service account and returns
+    the generative model
+    """
+    import vertexai
+    from vertexai.generative_models import GenerativeModel
+    from google.oauth2 import service_account
+
+    vertex_credentials = service_account.Credentials.from_service_account_file(vertex_key_path)
+    vertexai.init(credentials=vertex_credentials, project=PROJECT_ID, location="us-central1")
+    return GenerativeModel("gemini-1.5-flash-002")
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
@@ -88,44 +108,96 @@ def upload_image(file):
     destination_blob_name = os.path.join(prefix, file.filename)
     # Create a new blob and upload the file
     #blob = bucket.blob(file.filename)
-    blob = bucket.blob(destination_blob_name)
+    blob = get_bucket().blob(destination_blob_name)
     blob.upload_from_file(file)
     gs_url = f"gs://{bucket_name}/{destination_blob_name}"
     return gs_url
 
+PREDICTION_PROMPT = (
+    "Identify the plant in this image and the disease affecting it, and give 3 remediation steps. "
+    "Answer with one key value pair per line, exactly as:\n"
+    "Plant Name: <plant>\n"
+    "Disease Name: <disease>\n"
+    "Remediation 1: <step>\n"
+    "Remediation 2: <step>\n"
+    "Remediation 3: <step>\n"
+    "Keep the language concise and accessible."
+)
+
+def clean_line(line):
+    """Strips markdown emphasis, bullets and surrounding whitespace from a response line"""
+    return line.replace('*', '').strip().lstrip('-').strip()
+
+def parse_prediction(text):
+    """
+    Parses the model's "Key: value" lines into a dictionary keyed by the
+    lower-cased key, ignoring markdown emphasis and bullets.
+    """
+    fields = {}
+    for line in text.split("\n"):
+        line = clean_line(line)
+        if ':' not in line:
+            continue
+        key, value = line.split(':', 1)
+        if value.strip():
+            fields[key.strip().lower()] = value.strip()
+    return fields
+
+def model_remediation(text, fields):
+    """
+    Returns the model's numbered remediation steps. If the reply ignored the
+    "Remediation N:" format, its remaining non-empty lines are used instead.
+    """
+    remediation = {
+        str(i): fields[f'remediation {i}'] for i in range(1, 4) if f'remediation {i}' in fields
+    }
+    if remediation:
+        return remediation
+    lines = [clean_line(line) for line in text.split("\n")]
+    lines = [line for line in lines if line and not line.lower().startswith(('plant name', 'disease name'))]
+    return {str(i): line for i, line in enumerate(lines[:3], start=1)}
+
 def predict_image(image_url):
-    
-    model = GenerativeModel("gemini-1.5-flash-002")
-    
+    from vertexai.generative_models import Part
+
+    index = get_disease_index()
+    model = get_model()
+
     response = model.generate_content(
         [
             Part.from_uri(
                 image_url,
                 mime_type="image/jpeg",
             ),
-            "Identify the plant in this image. Describe the disease affecting the plant, and give 2-3 remediation steps. Keep the language concise and accessible. The response should be key value pair, plant name, disease details, remediation",
+            PREDICTION_PROMPT,
         ]
     )
-    print(response)
-    text = response.to_dict()
-    #text1 = text[0]['candidates']
-    final_text = text['candidates'][0]['content']['parts'][0]['text'].split("\n")[1:]
-    #print(final_text.split("\n"))
-    final_text = [ i.replace('*','') for i in final_text if i!=""]
-    #final_dict = {item.split(":")[0]: item.split(":")[1] for item in final_text}
-    plant_name = final_text[0].split(":")[1].strip()
-    disease_name = final_text[1].split(":")[1].strip()  # Extract disease name (assuming it's the first word after "Disease Details:")
-    remediation = {
-    '1': final_text[3].split(":")[1].strip(),
-    '2': final_text[4].split(":")[1].strip(),
-    '3': final_text[5].split(":")[1].strip(),
-    }
+    app.logger.debug(response)
+    text = response.to_dict()['candidates'][0]['content']['parts'][0]['text']
+    fields = parse_prediction(text)
+    plant_name = fields.get('plant name', '')
+    disease_name = fields.get('disease name', '')
+
+    # Curated remedies replace the model's steps whenever the knowledge base
+    # has an entry for this disease on this crop
+    entry = index.lookup(disease_name, plant_name)
+    if entry is not None:
+        remediation = remediation_steps(entry)
+        remediation_source = 'knowledge_base'
+    else:
+        remediation = model_remediation(text, fields)
+        remediation_source = 'model'
+    if not remediation:
+        raise ValueError('Model response did not include remediation steps')
+
     result_dict = {
     'plant_name': plant_name,
     'disease_name': disease_name,
-    'remediation': remediation
+    'matched_disease': entry['name'] if entry is not None else None,
+    'remediation': remediation,
+    'remediation_source': remediation_source
     }
-    print(final_text,"\n",result_dict)
+    app.logger.debug(result_dict)
     return result_dict
 
 
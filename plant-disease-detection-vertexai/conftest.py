@@ -0,0 +1 @@
+# Lets pytest import the service modules when run from this directory.
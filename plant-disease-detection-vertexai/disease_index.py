@@ -0,0 +1,213 @@
+import json
+import os
+import re
+import unicodedata
+from collections import defaultdict
+
+# Curated pestsAndDiseases[] / masterCrops[] in the user profile schema
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'pests_and_diseases.json')
+DATA_PATH = os.environ.get('PEST_DISEASE_DATA_PATH', DEFAULT_DATA_PATH)
+
+NGRAM_SIZE = 3
+MIN_MATCH_SCORE = 0.5
+REMEDY_ORDER = ('cultural', 'organic', 'chemical')
+
+_BLOCK_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+
+def normalize(text):
+    """
+    Case-folds text and collapses punctuation, symbols, whitespace and control
+    characters to single spaces. Combining marks and format characters such as
+    ZWJ/ZWNJ are kept, since Kannada and Devanagari spellings depend on them.
+    """
+    text = unicodedata.normalize('NFKC', str(text)).casefold()
+    categories = [unicodedata.category(c) for c in text]
+    chars = [' ' if cat[0] in 'PSZ' or cat == 'Cc' else c for c, cat in zip(text, categories)]
+    return ' '.join(''.join(chars).split())
+
+
+def ngrams(text, n=NGRAM_SIZE):
+    """Returns the set of padded character n-grams of an already normalized string"""
+    padded = f' {text} '
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class DiseaseIndex:
+    """
+    In-memory fuzzy index over curated pests and diseases.
+
+    Disease names, vernacular names (e.g. kn-IN, hi-IN) and symptoms are split
+    into character trigrams held in an inverted index, so a model-reported
+    disease_name resolves to its curated remedies without another LLM call.
+    Symptoms are only searchable; a disease_name resolves through names alone.
+    """
+
+    def __init__(self, pests_and_diseases, master_crops=()):
+        self.entries = list(pests_and_diseases)
+        self._exact = {}
+        self._keys = []  # (entry position, field, normalized key, n-gram count)
+        self._postings = defaultdict(list)
+        self._crop_ids = {}
+
+        for position, entry in enumerate(self.entries):
+            self._add_key(position, 'name', entry.get('name'))
+            for language, name in (entry.get('vernacularName') or {}).items():
+                self._add_key(position, f'vernacularName.{language}', name)
+            for symptom in entry.get('symptoms') or []:
+                self._add_key(position, 'symptoms', symptom)
+
+        for crop in master_crops:
+            names = [crop.get('name'), crop.get('scientificName'), *(crop.get('vernacularName') or {}).values()]
+            for name in names:
+                if name:
+                    self._crop_ids[normalize(name)] = crop.get('masterCropId')
+
+    @classmethod
+    def from_file(cls, path=DATA_PATH):
+        """
+        Builds the index from a JSON file holding either a full user profile
+        ("projectKisanData") or just its masterCrops/pestsAndDiseases sections.
+        Block comments left in hand-edited profiles are ignored.
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.loads(_BLOCK_COMMENT.sub('', f.read()))
+        data = data.get('projectKisanData', data)
+        return cls(data.get('pestsAndDiseases', []), data.get('masterCrops', []))
+
+    def _add_key(self, position, field, text):
+        key = normalize(text or '')
+        if not key:
+            return
+        self._exact.setdefault(key, (position, field))
+        grams = ngrams(key)
+        key_id = len(self._keys)
+        self._keys.append((position, field, key, len(grams)))
+        for gram in grams:
+            self._postings[gram].append(key_id)
+
+    def crop_id(self, plant_name):
+        """
+        Returns the masterCropId for a plant name in any indexed language, or None.
+
+        Besides exact names, a crop matches when its name appears as a run of
+        words in plant_name, spaces ignored ("Sugar cane", "Sugarcane leaves",
+        "Sugarcane (Saccharum officinarum)"), or scores at least MIN_MATCH_SCORE
+        on trigram Dice similarity.
+        """
+        key = normalize(plant_name or '')
+        if not key:
+            return None
+        if key in self._crop_ids:
+            return self._crop_ids[key]
+
+        tokens = key.split()
+        runs = {''.join(tokens[i:j]) for i in range(len(tokens)) for j in range(i + 1, len(tokens) + 1)}
+        contained = [name for name in self._crop_ids if name.replace(' ', '') in runs]
+        if contained:
+            return self._crop_ids[max(contained, key=len)]
+
+        grams = ngrams(key)
+        best_score, best_id = 0, None
+        for name, crop_id in self._crop_ids.items():
+            name_grams = ngrams(name)
+            score = 2 * len(grams & name_grams) / (len(grams) + len(name_grams))
+            if score > best_score:
+                best_score, best_id = score, crop_id
+        return best_id if best_score >= MIN_MATCH_SCORE else None
+
+    def _targets_crop(self, position, crop_id, strict):
+        """
+        Checks an entry against the crop. Entries without targetMasterCropIds apply
+        to every crop; otherwise an unknown crop only passes when not strict.
+        """
+        targets = self.entries[position].get('targetMasterCropIds') or []
+        if not targets:
+            return True
+        if crop_id is None:
+            return not strict
+        return crop_id in targets
+
+    def search(self, query, plant_name=None, limit=3, include_symptoms=True, strict_crop=False):
+        """
+        Ranks curated entries against a disease name or symptom description.
+
+        Args:
+            query: Disease name, vernacular name or symptom text
+            plant_name: Optional plant name used to keep only entries targeting that crop
+            limit: Maximum number of matches returned
+            include_symptoms: Whether symptom keys take part in the match
+            strict_crop: Drop crop-specific entries when the plant is not a known crop
+
+        Returns:
+            List of (score, entry, matched field) tuples, best first
+        """
+        key = normalize(query or '')
+        if not key:
+            return []
+        crop_id = self.crop_id(plant_name)
+
+        def eligible(position, field):
+            return ((include_symptoms or field != 'symptoms')
+                    and self._targets_crop(position, crop_id, strict_crop))
+
+        if key in self._exact and eligible(*self._exact[key]):
+            position, field = self._exact[key]
+            return [(1.0, self.entries[position], field)]
+
+        grams = ngrams(key)
+        shared = defaultdict(int)
+        for gram in grams:
+            for key_id in self._postings.get(gram, ()):
+                shared[key_id] += 1
+
+        # Dice coefficient on trigram sets, keeping each entry's best-scoring key
+        best = {}
+        for key_id, count in shared.items():
+            position, field, _, size = self._keys[key_id]
+            if not eligible(position, field):
+                continue
+            score = 2 * count / (len(grams) + size)
+            if score > best.get(position, (0, None))[0]:
+                best[position] = (score, field)
+
+        ranked = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [(score, self.entries[position], field) for position, (score, field) in ranked]
+
+    def lookup(self, disease_name, plant_name=None, min_score=MIN_MATCH_SCORE):
+        """
+        Resolves a detected disease name to its curated entry.
+
+        Only disease and vernacular names are matched, and an entry that targets
+        specific crops resolves only when plant_name maps to one of them.
+
+        Returns:
+            The best matching entry, or None if nothing scores at least min_score
+        """
+        matches = self.search(disease_name, plant_name, limit=1, include_symptoms=False, strict_crop=True)
+        if matches and matches[0][0] >= min_score:
+            return matches[0][1]
+        return None
+
+
+def remediation_steps(entry):
+    """
+    Flattens an entry's cultural/organic/chemical remedies into the numbered
+    {'1': ..., '2': ...} shape returned by the /predict endpoint.
+    """
+    remedies = entry.get('remedies') or {}
+    steps = [step for kind in REMEDY_ORDER for step in remedies.get(kind) or []]
+    return {str(i): step for i, step in enumerate(steps, start=1)}
+
+
+_index = None
+
+
+def get_disease_index():
+    """Returns the shared DiseaseIndex, loading it from DATA_PATH on first use"""
+    global _index
+    if _index is None:
+        _index = DiseaseIndex.from_file(DATA_PATH) if os.path.exists(DATA_PATH) else DiseaseIndex([])
+    return _index
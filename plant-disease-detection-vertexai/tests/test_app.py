@@ -0,0 +1,94 @@
+import pytest
+
+import app
+from disease_index import DiseaseIndex
+from tests.test_disease_index import MASTER_CROPS, POKKAH_BOENG
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def to_dict(self):
+        return {'candidates': [{'content': {'parts': [{'text': self.text}]}}]}
+
+
+class StubModel:
+    def __init__(self, text):
+        self.text = text
+        self.calls = []
+
+    def generate_content(self, contents):
+        self.calls.append(contents)
+        return StubResponse(self.text)
+
+
+@pytest.fixture
+def stub_model(monkeypatch):
+    """Returns a factory that installs a stub model replying with the given text"""
+    monkeypatch.setattr(app, 'get_disease_index', lambda: DiseaseIndex([POKKAH_BOENG], MASTER_CROPS))
+
+    def install(text):
+        model = StubModel(text)
+        monkeypatch.setattr(app, 'get_model', lambda: model)
+        return model
+    return install
+
+
+def test_parse_prediction_ignores_markdown_and_bullets():
+    text = "**Plant Name:** Tomato\n- Disease Name: Early Blight\n\nRemediation 1: Remove leaves: all of them"
+
+    assert app.parse_prediction(text) == {
+        'plant name': 'Tomato',
+        'disease name': 'Early Blight',
+        'remediation 1': 'Remove leaves: all of them',
+    }
+
+
+def test_predict_uses_model_steps_without_curated_entry(stub_model):
+    model = stub_model(
+        "Plant Name: Tomato\nDisease Name: Early Blight\n"
+        "Remediation 1: Remove affected leaves\nRemediation 2: Apply fungicide\nRemediation 3: Improve airflow"
+    )
+
+    result = app.predict_image('gs://bucket/uploads/leaf.jpg')
+
+    assert len(model.calls) == 1
+    assert result == {
+        'plant_name': 'Tomato',
+        'disease_name': 'Early Blight',
+        'matched_disease': None,
+        'remediation': {'1': 'Remove affected leaves', '2': 'Apply fungicide', '3': 'Improve airflow'},
+        'remediation_source': 'model',
+    }
+
+
+def test_predict_replaces_model_steps_with_curated_remedies(stub_model):
+    model = stub_model(
+        "Plant Name: Sugarcane plant\nDisease Name: Pokkah boeng disease\n"
+        "Remediation 1: Something generic\nRemediation 2: Other\nRemediation 3: More"
+    )
+
+    result = app.predict_image('gs://bucket/uploads/cane.jpg')
+
+    assert len(model.calls) == 1
+    assert result['disease_name'] == 'Pokkah boeng disease'
+    assert result['matched_disease'] == 'Pokkah Boeng'
+    assert result['remediation_source'] == 'knowledge_base'
+    assert result['remediation']['1'] == 'Ensure proper field drainage'
+
+
+def test_predict_falls_back_to_unformatted_steps(stub_model):
+    stub_model("Plant Name: Rice\nDisease Name: Blast\n1. Use resistant varieties\n2. Drain the field")
+
+    result = app.predict_image('gs://bucket/uploads/rice.jpg')
+
+    assert result['remediation'] == {'1': '1. Use resistant varieties', '2': '2. Drain the field'}
+    assert result['remediation_source'] == 'model'
+
+
+def test_predict_without_any_steps_is_an_error(stub_model):
+    stub_model("Plant Name: Rice\nDisease Name: Blast")
+
+    with pytest.raises(ValueError):
+        app.predict_image('gs://bucket/uploads/rice.jpg')
@@ -0,0 +1,119 @@
+import pytest
+
+from disease_index import DiseaseIndex, normalize, remediation_steps
+
+MASTER_CROPS = [
+    {"masterCropId": "master_crop_sugarcane", "name": "Sugarcane",
+     "vernacularName": {"kn-IN": "ಕಬ್ಬು", "hi-IN": "गन्ना"}},
+    {"masterCropId": "master_crop_tomato", "name": "Tomato",
+     "vernacularName": {"kn-IN": "ಟೊಮೇಟೊ", "hi-IN": "टमाटर"}},
+]
+
+POKKAH_BOENG = {
+    "pestDiseaseId": "disease_pokkah_boeng",
+    "name": "Pokkah Boeng",
+    "vernacularName": {"kn-IN": "ಪೋಕ್ಕಾ ಬೋಯಿಂಗ್"},
+    "targetMasterCropIds": ["master_crop_sugarcane"],
+    "symptoms": ["Wrinkled/discolored top leaves", "Stunted growth"],
+    "remedies": {
+        "chemical": ["Spray Carbendazim or Copper Oxychloride"],
+        "organic": ["Spray a solution of Trichoderma viride"],
+        "cultural": ["Ensure proper field drainage", "Avoid excessive nitrogen application"],
+    },
+}
+
+APHIDS = {
+    "pestDiseaseId": "pest_aphids",
+    "name": "Aphids",
+    "vernacularName": {"hi-IN": "माहू"},
+    "targetMasterCropIds": [],
+    "symptoms": ["Curled leaves"],
+    "remedies": {"organic": ["Spray neem oil"]},
+}
+
+
+@pytest.fixture
+def index():
+    return DiseaseIndex([POKKAH_BOENG, APHIDS], MASTER_CROPS)
+
+
+@pytest.mark.parametrize("disease_name, plant_name", [
+    ("Pokkah Boeng", "Sugarcane"),
+    ("pokkah boeng disease", "sugarcane"),
+    ("Pokka Boing", "ಕಬ್ಬು"),
+    ("ಪೋಕ್ಕಾ ಬೋಯಿಂಗ್", "गन्ना"),
+    ("Pokkah Boeng", "Sugar cane"),
+    ("Pokkah Boeng", "Sugarcane plant"),
+    ("Pokkah Boeng", "sugarcane leaves"),
+    ("Pokkah Boeng", "Sugarcane (Saccharum officinarum)"),
+    ("Pokkah Boeng", "Sugarcain"),
+])
+def test_lookup_resolves_names_for_target_crop(index, disease_name, plant_name):
+    assert index.lookup(disease_name, plant_name) is POKKAH_BOENG
+
+
+@pytest.mark.parametrize("disease_name, plant_name", [
+    ("Stunted growth", "Rice"),
+    ("Stunted", "Wheat"),
+    ("Pokkah Boeng", "Rice"),
+    ("Pokkah Boeng", "Tomato"),
+    ("Pokkah Boeng", None),
+])
+def test_lookup_rejects_other_or_unknown_crops(index, disease_name, plant_name):
+    assert index.lookup(disease_name, plant_name) is None
+
+
+def test_lookup_ignores_symptoms(index):
+    assert index.lookup("Stunted growth", "Sugarcane") is None
+
+
+def test_lookup_entries_without_targets_apply_to_any_crop(index):
+    assert index.lookup("Aphids", "Rice") is APHIDS
+    assert index.lookup("माहू") is APHIDS
+
+
+def test_lookup_rejects_weak_matches(index):
+    assert index.lookup("Early Blight", "Tomato") is None
+
+
+def test_search_still_matches_symptoms(index):
+    score, entry, field = index.search("wrinkled discolored top leaves")[0]
+
+    assert (score, entry, field) == (1.0, POKKAH_BOENG, "symptoms")
+
+
+def test_normalize_keeps_joiners_and_marks():
+    assert normalize("क्\u200dष") == "क्\u200dष"
+    assert normalize("ಕ್\u200cಷ") == "ಕ್\u200cಷ"
+    assert normalize("Wrinkled/discolored  TOP leaves!") == "wrinkled discolored top leaves"
+
+
+def test_remediation_steps_are_numbered_cultural_first():
+    assert remediation_steps(POKKAH_BOENG) == {
+        "1": "Ensure proper field drainage",
+        "2": "Avoid excessive nitrogen application",
+        "3": "Spray a solution of Trichoderma viride",
+        "4": "Spray Carbendazim or Copper Oxychloride",
+    }
+
+
+def test_from_file_reads_profile_with_block_comments(tmp_path):
+    path = tmp_path / "user.json"
+    path.write_text(
+        '{"projectKisanData": {"masterCrops": [{"masterCropId": "master_crop_sugarcane", "name": "Sugarcane",'
+        ' "knowledgeBase": { /* ... */ }}], "pestsAndDiseases": [{"name": "Pokkah Boeng",'
+        ' "targetMasterCropIds": ["master_crop_sugarcane"]}]}}',
+        encoding="utf-8",
+    )
+
+    assert DiseaseIndex.from_file(str(path)).lookup("Pokkah Boeng", "Sugarcane")["name"] == "Pokkah Boeng"
+
+
+@pytest.mark.parametrize("plant_name", ["Potato", "Chickpea", "Rice", ""])
+def test_crop_id_does_not_match_other_plants(plant_name):
+    index = DiseaseIndex([], [
+        {"masterCropId": "master_crop_tomato", "name": "Tomato"},
+        {"masterCropId": "master_crop_pea", "name": "Pea"},
+    ])
+
+    assert index.crop_id(plant_name) is None
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Cold-start profiler for the agent package and the Plant Disease Detection API.
+
+Each run starts a fresh interpreter with `-X importtime` and times the steps a
+scale-to-zero container pays before it can answer:
+
+  agentic  import the `app` package, then resolve `app.agent.root_agent`,
+           which builds the sub-agent tree and imports the tools
+  vision   import app.py, answer the first GET /health, then have the
+           Storage bucket and Vertex AI model ready for the first /predict
+
+With --baseline REF the same steps are timed on the service as of that git
+ref (extracted with `git archive`), so both sets of numbers come from one run.
+
+Usage:
+    python profile_startup.py {agentic,vision} [--runs 5] [--top 15] [--baseline REF]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SERVICES = {
+    'agentic': {
+        'dir': 'agentic',
+        'metrics': ('import_s', 'time_to_root_agent_s'),
+        'snippet': """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+root_agent = app.agent.root_agent
+built = time.perf_counter()
+print(json.dumps({'import_s': imported - start, 'time_to_root_agent_s': built - start}))
+""",
+    },
+    'vision': {
+        'dir': 'plant-disease-detection-vertexai',
+        'metrics': ('import_s', 'time_to_first_health_s', 'time_to_predict_ready_s'),
+        'snippet': """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+status = app.app.test_client().get('/health').status_code
+health = time.perf_counter()
+# Older versions create the clients at import; newer ones on the first /predict
+if hasattr(app, 'get_model'):
+    app.get_bucket()
+    app.get_model()
+ready = time.perf_counter()
+assert status == 200, status
+print(json.dumps({
+    'import_s': imported - start,
+    'time_to_first_health_s': health - start,
+    'time_to_predict_ready_s': ready - start,
+}))
+""",
+    },
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parses `-X importtime` output into {top-level package: cumulative seconds}.
+
+    A package is counted where it is first entered from a different package,
+    so e.g. `vertexai` shows the full cost of importing it even when app.py
+    is the module that pulled it in.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip().split('.')[0], int(cumulative) / 1e6))
+
+    # importtime prints children before their parent; walking it backwards
+    # visits every parent before its children
+    totals = {}
+    ancestors = []
+    for depth, package, seconds in reversed(entries):
+        del ancestors[depth:]
+        if package not in ancestors:
+            totals[package] = totals.get(package, 0) + seconds
+        ancestors.append(package)
+    return totals
+
+
+def cold_start(service, source_dir):
+    """
+    Runs one cold start in a fresh interpreter and returns (timings, import breakdown).
+
+    The code is imported from source_dir while the working directory stays the
+    checked-out service, so untracked files such as service account keys and
+    .env are found for every version.
+    """
+    cwd = os.path.join(REPO_DIR, service['dir'])
+    # `python -c` puts the working directory first on sys.path; source_dir must win
+    code = f"import sys; sys.path.insert(0, {source_dir!r})\n" + service['snippet']
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Cold start failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, parse_importtime(result.stderr)
+
+
+def extract(ref, subdir, destination):
+    """Extracts subdir as of a git ref into destination and returns its path"""
+    archive = subprocess.run(['git', 'archive', ref, subdir], cwd=REPO_DIR, capture_output=True, check=True)
+    subprocess.run(['tar', '-x', '-C', destination], input=archive.stdout, check=True)
+    return os.path.join(destination, subdir)
+
+
+def profile(service, source_dir, runs):
+    """Returns the median timings and median import breakdown over several cold starts"""
+    results = [cold_start(service, source_dir) for _ in range(runs)]
+    timings = {key: statistics.median(t[key] for t, _ in results) for key in service['metrics']}
+    modules = {name for _, breakdown in results for name in breakdown}
+    breakdown = {name: statistics.median(b.get(name, 0) for _, b in results) for name in modules}
+    return timings, breakdown
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('service', choices=sorted(SERVICES))
+    parser.add_argument('--runs', type=int, default=5, help='Number of cold starts to measure')
+    parser.add_argument('--top', type=int, default=15, help='Number of packages in the import breakdown')
+    parser.add_argument('--baseline', metavar='REF', help='Git ref to compare the working tree against')
+    args = parser.parse_args()
+    service = SERVICES[args.service]
+
+    current = profile(service, os.path.join(REPO_DIR, service['dir']), args.runs)
+    baseline = None
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = profile(service, extract(args.baseline, service['dir'], tmp), args.runs)
+
+    columns = [('current', current)] + ([(args.baseline, baseline)] if baseline else [])
+    header = ''.join(f"{label[:12]:>14}" for label, _ in columns)
+    print(f"Cold start of {args.service} over {args.runs} runs (median, ms)")
+    print(f"  {'':<26}{header}")
+    for key in service['metrics']:
+        print(f"  {key:<26}" + ''.join(f"{timings[key] * 1000:14.1f}" for _, (timings, _) in columns))
+
+    def slowest(name):
+        return max(b.get(name, 0) for _, (_, b) in columns)
+
+    modules = {name for _, (_, b) in columns for name in b}
+    print(f"\nImport-time breakdown (top {args.top}, cumulative ms)")
+    print(f"  {'':<26}{header}")
+    for name in sorted(modules, key=slowest, reverse=True)[:args.top]:
+        print(f"  {name:<26}" + ''.join(f"{b.get(name, 0) * 1000:14.1f}" for _, (_, b) in columns))
+
+
+if __name__ == '__main__':
+    main()